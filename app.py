@@ -3,20 +3,30 @@ Streamlit Web UI for Trails FC Arts Simulator
 """
 import streamlit as st
 import streamlit.components.v1 as components
+import copy
 import json
 import os
+import hashlib
 import html
 import multiprocessing
+import pickle
+import time
+import uuid
 from pathlib import Path
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from solver import BuildFinder
 from helpers import GameData
 
-# Set multiprocessing start method for compatibility (especially macOS)
 try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib json module
+
+# Set multiprocessing start method for compatibility (especially macOS);
+# only the first run of the script needs to do it
+if multiprocessing.get_start_method(allow_none=True) != 'spawn':
     multiprocessing.set_start_method('spawn', force=True)
-except RuntimeError:
-    pass  # Already set
 
 # Page configuration
 st.set_page_config(
@@ -35,13 +45,67 @@ def load_game_data():
 
 game_data = load_game_data()
 
+
+# Static lookups derived from the game data, computed once per server process
+GameIndices = namedtuple(
+    "GameIndices",
+    ["character_names", "character_index", "quartz_names", "art_names"],
+)
+
+
+@st.cache_resource
+def load_game_indices():
+    """Get display-ordered names and the character name -> index lookup."""
+    character_names = tuple(sorted(char.name for char in game_data.characters))
+    return GameIndices(
+        character_names=character_names,
+        character_index={name: i for i, name in enumerate(character_names)},
+        quartz_names=tuple(sorted(game_data.quartz_map)),
+        art_names=tuple(sorted(game_data.arts_map)),
+    )
+
+
+game_indices = load_game_indices()
+
+
+def find_unreachable_arts(art_names, quartz_set):
+    """Get arts needing an element that none of the given quartz provide."""
+    unreachable = []
+    quartz_mask = game_data.quartz_to_mask(quartz_set)
+    for art_name in art_names:
+        art = game_data.arts_map.get(art_name)
+        if art is None:
+            continue
+        for element, value in art.requirements.items():
+            if value > 0 and not (
+                    game_data.quartz_by_element.get(element, 0) & quartz_mask):
+                unreachable.append(art_name)
+                break
+    return unreachable
+
+
 # Settings directory
 SETTINGS_DIR = Path(".saved_settings")
-SETTINGS_DIR.mkdir(exist_ok=True)
 
 # Cache directory
 CACHE_DIR = Path(".cache")
-CACHE_DIR.mkdir(exist_ok=True)
+
+# Leading byte of cache files; bump when the cached build format changes
+CACHE_FORMAT_VERSION = b"\x03"
+
+# Most cached results kept on disk; least recently used are evicted first
+MAX_CACHE_FILES = 200
+
+
+@st.cache_resource
+def ensure_data_dirs():
+    """Create the settings and cache directories once per server process."""
+    SETTINGS_DIR.mkdir(exist_ok=True)
+    CACHE_DIR.mkdir(exist_ok=True)
+    return True
+
+
+ensure_data_dirs()
 
 # Element color mapping (centralized)
 ELEMENT_COLORS = {
@@ -54,6 +118,29 @@ ELEMENT_COLORS = {
     "Mirage": "#969696"    # Grey
 }
 
+# Order in which elements are listed in the results
+ELEMENT_ORDER = ("Earth", "Water", "Fire", "Wind", "Time", "Space", "Mirage")
+
+
+def json_dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize an object to JSON bytes (orjson when available)."""
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None,
+                      sort_keys=sort_keys).encode()
+
+
+def json_loads(data: bytes):
+    """Deserialize JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def generate_multiselect_css(game_data):
     """Generate JavaScript to dynamically color multiselect tags based on element."""
@@ -73,8 +160,7 @@ def generate_multiselect_css(game_data):
             item_colors[art_name] = ELEMENT_COLORS[element]
     
     # Convert to JSON for JavaScript
-    import json
-    colors_json = json.dumps(item_colors)
+    colors_json = json_dumps(item_colors).decode()
     
     # Generate CSS + JavaScript that colors the tags
     script = f"""
@@ -132,125 +218,204 @@ def generate_multiselect_css(game_data):
     return script
 
 
-def generate_cache_key(character_name, quartz_set, desired_arts, max_builds, prioritized_quartz):
+def generate_cache_key(character_name, quartz_set, desired_arts, max_builds, prioritized_quartz,
+                       filter_without_all_prioritized):
     """Generate a unique cache key for a search configuration."""
-    import hashlib
-
-    # Create a deterministic string representation
-    config_str = json.dumps({
-        "character": character_name,
-        "quartz": sorted(list(quartz_set)),
-        "arts": sorted(desired_arts),
-        "max_builds": max_builds,
-        "prioritized_quartz": sorted(list(prioritized_quartz))
-    }, sort_keys=True)
+    # Create a deterministic byte representation (repr of str/int/bool
+    # tuples is stable, and cheaper than a JSON encode)
+    config_bytes = repr((
+        character_name,
+        tuple(sorted(quartz_set)),
+        tuple(sorted(desired_arts)),
+        max_builds,
+        tuple(sorted(prioritized_quartz)),
+        filter_without_all_prioritized,
+    )).encode()
 
     # Generate hash
-    return hashlib.md5(config_str.encode()).hexdigest()
+    return hashlib.blake2b(config_bytes, digest_size=8).hexdigest()
 
 
 def save_cached_results(cache_key, builds):
     """Save build results to cache."""
-    cache_file = CACHE_DIR / f"{cache_key}.json"
-
-    # Convert sets to lists for JSON serialization
-    serializable_builds = []
-    for build in builds:
-        serializable_build = build.copy()
-        if 'unlocked_arts' in serializable_build:
-            serializable_build['unlocked_arts'] = sorted(
-                list(serializable_build['unlocked_arts']))
-        serializable_builds.append(serializable_build)
-
-    with open(cache_file, 'w') as f:
-        json.dump(serializable_builds, f, indent=2)
+    cache_file = CACHE_DIR / f"{cache_key}.pkl"
+    atomic_write_bytes(
+        cache_file, CACHE_FORMAT_VERSION + pickle.dumps(builds, protocol=5))
+    evict_cached_results()
+    count_cache_items.clear()
+
+
+def evict_cached_results():
+    """Delete the least recently used cache files beyond MAX_CACHE_FILES."""
+    cache_files = []
+    with os.scandir(CACHE_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".pkl"):
+                continue
+            try:
+                cache_files.append((entry.stat().st_mtime_ns, entry.path))
+            except FileNotFoundError:
+                # Removed meanwhile (cache cleared or evicted by another session)
+                pass
+    if len(cache_files) <= MAX_CACHE_FILES:
+        return
+    cache_files.sort()
+    for _, path in cache_files[:len(cache_files) - MAX_CACHE_FILES]:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
 
 
 def load_cached_results(cache_key):
     """Load build results from cache if available."""
-    cache_file = CACHE_DIR / f"{cache_key}.json"
-
-    if not cache_file.exists():
+    cache_file = CACHE_DIR / f"{cache_key}.pkl"
+    try:
+        data = cache_file.read_bytes()
+        # Mark as recently used for eviction
+        os.utime(cache_file)
+    except FileNotFoundError:
         return None
 
-    with open(cache_file, 'r') as f:
-        builds = json.load(f)
-
-    # Convert lists back to sets
-    for build in builds:
-        if 'unlocked_arts' in build:
-            build['unlocked_arts'] = set(build['unlocked_arts'])
-
-    return builds
+    # Ignore caches written in another format
+    if data[:1] != CACHE_FORMAT_VERSION:
+        return None
+    try:
+        return pickle.loads(memoryview(data)[1:])
+    except (pickle.UnpicklingError, EOFError, ValueError):
+        return None
 
 
+@st.cache_data(ttl=5)
 def count_cache_items():
     """Count the number of cached results."""
-    if not CACHE_DIR.exists():
+    try:
+        with os.scandir(CACHE_DIR) as entries:
+            return sum(1 for entry in entries if entry.name.endswith(".pkl"))
+    except FileNotFoundError:
         return 0
-    return len(list(CACHE_DIR.glob("*.json")))
 
 
 def clear_cache():
     """Clear all cached results."""
-    if not CACHE_DIR.exists():
+    try:
+        with os.scandir(CACHE_DIR) as entries:
+            cache_files = [Path(entry.path) for entry in entries
+                           if entry.name.endswith(".pkl")]
+    except FileNotFoundError:
         return 0
 
-    count = 0
-    for cache_file in CACHE_DIR.glob("*.json"):
-        cache_file.unlink()
-        count += 1
-    return count
+    # Unlinking is I/O-bound, so a few threads hide the per-file latency
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda path: path.unlink(missing_ok=True), cache_files))
+    count_cache_items.clear()
+    return len(cache_files)
 
 
 # Last session file
-LAST_SESSION_FILE = SETTINGS_DIR / ".last_session.json"
+LAST_SESSION_FILE = SETTINGS_DIR / ".last_session"
+
+
+def atomic_write_bytes(filepath: Path, payload: bytes):
+    """Write a file in one call via a temp file, so it is never left truncated."""
+    # A unique temp file per write, so concurrent sessions never share one
+    tmp_path = filepath.with_name(f"{filepath.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "xb") as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_if_changed(filepath: Path, payload: bytes) -> bool:
+    """Write payload to a file unless the file already holds exactly those bytes."""
+    try:
+        if filepath.read_bytes() == payload:
+            return False
+    except FileNotFoundError:
+        pass
+    atomic_write_bytes(filepath, payload)
+    return True
 
 
 def save_settings(filename: str, settings: dict):
     """Save settings to a JSON file."""
     filepath = SETTINGS_DIR / f"{filename}.json"
-    with open(filepath, 'w') as f:
-        json.dump(settings, f, indent=2)
+    payload = json_dumps(settings, indent=True, sort_keys=True)
+    if write_if_changed(filepath, payload):
+        list_saved_settings.clear()
+        read_settings_file.clear()
     return filepath
 
 
+@st.cache_data(max_entries=16)
+def read_settings_file(filename: str, mtime_ns: int) -> dict:
+    """Decode a settings file; keyed on its mtime so edits are picked up."""
+    filepath = SETTINGS_DIR / f"{filename}.json"
+    try:
+        return json_loads(filepath.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
 def load_settings(filename: str) -> dict:
     """Load settings from a JSON file."""
     filepath = SETTINGS_DIR / f"{filename}.json"
-    if filepath.exists():
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    return None
+    try:
+        mtime_ns = filepath.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return read_settings_file(filename, mtime_ns)
 
 
 def save_last_session(settings_name: str, auto_save: bool):
-    """Save last session state."""
-    session_data = {
-        'last_settings_file': settings_name,
-        'auto_save': auto_save
-    }
-    with open(LAST_SESSION_FILE, 'w') as f:
-        json.dump(session_data, f, indent=2)
+    """Save last session state (skipped if unchanged since the last write)."""
+    state = (settings_name, auto_save)
+    if st.session_state.get('_last_session_written') == state:
+        return
+    # Two lines: settings file name, then the auto-save flag as 0/1
+    atomic_write_bytes(
+        LAST_SESSION_FILE, f"{settings_name}\n{int(auto_save)}\n".encode("utf-8"))
+    st.session_state._last_session_written = state
 
 
 def load_last_session() -> dict:
     """Load last session state."""
-    if LAST_SESSION_FILE.exists():
-        try:
-            with open(LAST_SESSION_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            pass
-    return None
+    try:
+        name, flag = LAST_SESSION_FILE.read_text(
+            encoding="utf-8").splitlines()[:2]
+        auto_save = bool(int(flag))
+    except (OSError, ValueError):
+        # Missing, unreadable or malformed (too few lines, bad flag)
+        return None
+    return {'last_settings_file': name, 'auto_save': auto_save}
+
+
+@st.cache_data(max_entries=4)
+def list_saved_settings(dir_mtime_ns: int):
+    """List saved settings files; keyed on the directory mtime."""
+    # Dotfiles (e.g. .last_session) are internal, not saved settings
+    with os.scandir(SETTINGS_DIR) as entries:
+        files = [
+            entry.name[:-5] for entry in entries
+            if entry.name.endswith(".json") and not entry.name.startswith(".")
+        ]
+    files.sort()
+    return files
 
 
 def get_saved_settings_list():
     """Get list of saved settings files."""
-    if not SETTINGS_DIR.exists():
+    try:
+        dir_mtime_ns = SETTINGS_DIR.stat().st_mtime_ns
+    except FileNotFoundError:
         return []
-    files = [f.stem for f in SETTINGS_DIR.glob("*.json")]
-    return sorted(files)
+    return list_saved_settings(dir_mtime_ns)
 
 
 def delete_settings(filename: str):
@@ -258,58 +423,69 @@ def delete_settings(filename: str):
     filepath = SETTINGS_DIR / f"{filename}.json"
     if filepath.exists():
         filepath.unlink()
+    st.session_state.pop('_last_saved_state', None)
+    list_saved_settings.clear()
+    read_settings_file.clear()
+
+
+# Settings used when there is no saved file to restore
+DEFAULT_SETTINGS_STATE = {
+    'selected_character': "Estelle",
+    'selected_quartz': [],
+    'prioritized_quartz': [],
+    'selected_arts': [],
+    'max_builds': 50,
+    'use_parallel': False,
+    'filter_without_all_prioritized': False,
+}
 
 
-# Initialize session state
-if 'initialized' not in st.session_state:
-    # Load last session if available
+def read_initial_session_state() -> dict:
+    """Read the last session and its settings file into initial session state."""
+    state = {'settings_name': "default", 'auto_save': True,
+             **copy.deepcopy(DEFAULT_SETTINGS_STATE)}
+
     last_session = load_last_session()
+    if not last_session:
+        return state
+
+    state['settings_name'] = last_session.get('last_settings_file', 'default')
+    state['auto_save'] = last_session.get('auto_save', True)
+    state['_last_session_written'] = (
+        state['settings_name'], state['auto_save'])
+
+    # Try to load the last settings file
+    loaded = load_settings(state['settings_name'])
+    if loaded:
+        state['selected_character'] = loaded.get('character', 'Estelle')
+        for key in ('selected_quartz', 'prioritized_quartz', 'selected_arts',
+                    'max_builds', 'use_parallel',
+                    'filter_without_all_prioritized'):
+            if key in loaded:
+                state[key] = loaded[key]
+    return state
 
-    if last_session:
-        st.session_state.settings_name = last_session.get(
-            'last_settings_file', 'default')
-        st.session_state.auto_save = last_session.get('auto_save', True)
-
-        # Try to load the last settings file
-        loaded = load_settings(st.session_state.settings_name)
-        if loaded:
-            st.session_state.selected_character = loaded.get(
-                'character', 'Estelle')
-            st.session_state.selected_quartz = loaded.get(
-                'selected_quartz', [])
-            st.session_state.prioritized_quartz = loaded.get(
-                'prioritized_quartz', [])
-            st.session_state.selected_arts = loaded.get('selected_arts', [])
-            st.session_state.max_builds = loaded.get('max_builds', 50)
-            st.session_state.use_parallel = loaded.get('use_parallel', False)
-            st.session_state.filter_without_all_prioritized = loaded.get('filter_without_all_prioritized', False)
-        else:
-            # File doesn't exist, use defaults
-            st.session_state.selected_character = "Estelle"
-            st.session_state.selected_quartz = []
-            st.session_state.prioritized_quartz = []
-            st.session_state.selected_arts = []
-            st.session_state.max_builds = 50
-            st.session_state.use_parallel = False
-            st.session_state.filter_without_all_prioritized = False
-    else:
-        # No last session, use defaults
-        st.session_state.settings_name = "default"
-        st.session_state.auto_save = True
-        st.session_state.selected_character = "Estelle"
-        st.session_state.selected_quartz = []
-        st.session_state.prioritized_quartz = []
-        st.session_state.selected_arts = []
-        st.session_state.max_builds = 50
-        st.session_state.use_parallel = False
-        st.session_state.filter_without_all_prioritized = False
 
+# Initialize session state
+if 'initialized' not in st.session_state:
+    st.session_state.update(read_initial_session_state())
     st.session_state.initialized = True
 
 
 def auto_save_if_enabled():
     """Auto-save current settings if enabled."""
-    if st.session_state.auto_save:
+    # Cheap pre-check so unchanged settings are not even serialized
+    state = (
+        st.session_state.settings_name,
+        st.session_state.selected_character,
+        tuple(st.session_state.selected_quartz),
+        tuple(st.session_state.prioritized_quartz),
+        tuple(st.session_state.selected_arts),
+        st.session_state.max_builds,
+        st.session_state.use_parallel,
+        st.session_state.filter_without_all_prioritized,
+    )
+    if st.session_state.auto_save and st.session_state.get('_last_saved_state') != state:
         settings = {
             'character': st.session_state.selected_character,
             'selected_quartz': st.session_state.selected_quartz,
@@ -320,12 +496,122 @@ def auto_save_if_enabled():
             'filter_without_all_prioritized': st.session_state.filter_without_all_prioritized
         }
         save_settings(st.session_state.settings_name, settings)
+        st.session_state._last_saved_state = state
 
     # Always save last session state (which file is open, auto-save preference)
     save_last_session(st.session_state.settings_name,
                       st.session_state.auto_save)
 
 
+# Tooltip styles for the quartz and arts columns of the results
+RESULTS_CSS = """
+<style>
+.quartz-tooltip {
+    position: relative;
+    display: inline-block;
+    cursor: help;
+    margin: 0 4px;
+}
+.quartz-tooltip .tooltiptext-quartz {
+    visibility: hidden;
+    width: 250px;
+    background-color: #555;
+    color: #fff;
+    text-align: left;
+    border-radius: 6px;
+    padding: 8px;
+    position: absolute;
+    z-index: 1000;
+    top: 0;
+    left: 100%;
+    margin-left: 10px;
+    opacity: 0;
+    transition: opacity 0.3s;
+    font-size: 0.85em;
+    line-height: 1.4;
+    white-space: pre-wrap;
+}
+.quartz-tooltip:hover .tooltiptext-quartz {
+    visibility: visible;
+    opacity: 1;
+}
+.art-line {
+    display: block;
+    line-height: 1.6;
+}
+.art-tooltip {
+    position: relative;
+    display: inline-block;
+    cursor: help;
+    color: var(--c);
+    font-size: 0.9em;
+}
+.art-tooltip .tooltiptext {
+    visibility: hidden;
+    width: 300px;
+    background-color: #555;
+    color: #fff;
+    text-align: left;
+    border-radius: 6px;
+    padding: 8px;
+    position: absolute;
+    z-index: 1000;
+    top: 0;
+    left: 100%;
+    margin-left: 10px;
+    opacity: 0;
+    transition: opacity 0.3s;
+    font-size: 0.85em;
+    line-height: 1.4;
+    white-space: pre-wrap;
+}
+.art-tooltip:hover .tooltiptext {
+    visibility: visible;
+    opacity: 1;
+}
+</style>
+"""
+
+# Separator between quartz on the same line
+QUARTZ_ARROW_HTML = '<span style="color: #888; margin: 0 4px;">→</span>'
+
+# One unlocked art with its tooltip; the color is passed as a CSS variable
+ART_LINE_TEMPLATE = ('<div class="art-line"><span class="art-tooltip" style="--c: {color}">'
+                     '{marker} {name}<span class="tooltiptext">{effect} | {range}\n{description}'
+                     '</span></span></div>')
+
+
+@st.cache_resource
+def load_quartz_badges():
+    """Get the colored, tooltipped HTML snippet for every quartz."""
+    badges = {}
+    for quartz_name, quartz_data in game_data.quartz_map.items():
+        color = ELEMENT_COLORS.get(quartz_data.quartz_element, "#888888")
+        tooltip = quartz_data.description if quartz_data.description else "No description"
+        badges[quartz_name] = f'<span class="quartz-tooltip" style="color: {color}; font-size: 0.9em;">{quartz_name}<span class="tooltiptext-quartz">{tooltip}</span></span>'
+    return badges
+
+
+# Number of builds rendered per results page
+RESULTS_PAGE_SIZE = 20
+
+# Minimum delay between two search progress messages (seconds)
+PROGRESS_UPDATE_INTERVAL = 0.1
+
+
+def mark_settings_dirty():
+    """Flag the current settings as changed so the next flush auto-saves them."""
+    st.session_state._settings_dirty = True
+
+
+def flush_settings_if_dirty():
+    """Auto-save pending settings changes (unchanged settings are not rewritten)."""
+    if not st.session_state.get('_settings_dirty'):
+        return
+    auto_save_if_enabled()
+    st.session_state._settings_dirty = False
+
+
 # Title
 st.title("🎮 Trails in the Sky FC - Arts Simulator")
 st.markdown("Find optimal quartz builds for your desired arts")
@@ -342,19 +628,20 @@ with st.sidebar:
     st.subheader("Load/Save Settings")
 
     saved_files = get_saved_settings_list()
+    saved_file_index = {name: i for i, name in enumerate(saved_files)}
 
     col1, col2 = st.columns([3, 1])
     with col1:
         selected_file = st.selectbox(
             "Settings File",
             options=["<new>"] + saved_files,
-            index=0 if st.session_state.settings_name not in saved_files
-            else saved_files.index(st.session_state.settings_name) + 1
+            # Position after "<new>", or 0 when the name is not saved
+            index=saved_file_index.get(st.session_state.settings_name, -1) + 1
         )
 
     with col2:
-        st.write("")
-        st.write("")
+        # Align the button with the selectbox input (one element, not two)
+        st.markdown("<div style='height:1.8em'></div>", unsafe_allow_html=True)
         if selected_file != "<new>" and st.button("🗑️"):
             delete_settings(selected_file)
             st.rerun()
@@ -441,6 +728,107 @@ with st.sidebar:
         st.rerun()
 
 
+@st.fragment
+def render_results(cache_key: str):
+    """Render the builds for the current inputs; paging reruns only this fragment."""
+    if st.session_state.get('last_builds_key') != cache_key:
+        return
+    builds = st.session_state.get('last_builds')
+    if builds:
+        st.success(f"✅ Found {len(builds)} valid builds!")
+
+        # Only render one page of builds per rerun
+        num_pages = (len(builds) + RESULTS_PAGE_SIZE - 1) // RESULTS_PAGE_SIZE
+        page = 1
+        if num_pages > 1:
+            page = st.number_input(
+                "Page", min_value=1, max_value=num_pages, step=1,
+                key="results_page")
+        page_start = (page - 1) * RESULTS_PAGE_SIZE
+        if num_pages > 1:
+            page_end = min(page_start + RESULTS_PAGE_SIZE, len(builds))
+            st.caption(
+                f"Showing builds {page_start + 1}-{page_end} of {len(builds)}")
+
+        # Desired arts are starred in every build
+        selected_arts_set = set(st.session_state.selected_arts)
+
+        # Tooltip styles and quartz badges are shared by every build
+        st.markdown(RESULTS_CSS, unsafe_allow_html=True)
+        quartz_badges = load_quartz_badges()
+
+        # Display builds
+        for i, build in enumerate(
+                builds[page_start:page_start + RESULTS_PAGE_SIZE], start=page_start):
+            with st.expander(
+                f"Build #{i+1} - {build['total_arts']} arts unlocked",
+                expanded=(i == 0)
+            ):
+                col1, col2 = st.columns([1, 1])
+
+                with col1:
+                    st.markdown("**🔮 Quartz Setup**")
+
+                    # Group by line
+                    by_line = defaultdict(list)
+                    for placement in build['placements']:
+                        by_line[placement['line_index']].append(placement)
+
+                    # One markdown block for the whole setup
+                    setup_md = []
+                    for line_idx in sorted(by_line.keys()):
+                        if line_idx == -1:
+                            setup_md.append("**Shared:**")
+                        else:
+                            # Elements for this line (computed by the solver)
+                            if line_idx < len(build['line_elements']):
+                                line_elements = build['line_elements'][line_idx]
+                                elem_str = ", ".join([f"{e}: {v}" for e, v in sorted(
+                                    line_elements.items())]) if line_elements else "None"
+                                setup_md.append(
+                                    f"**Line {line_idx + 1}:** `{elem_str}`")
+
+                        # Show quartz with colors and tooltips
+                        setup_md.append(QUARTZ_ARROW_HTML.join(
+                            quartz_badges.get(placement['quartz'], placement['quartz'])
+                            for placement in by_line[line_idx]))
+
+                    st.markdown("\n\n".join(setup_md), unsafe_allow_html=True)
+
+                with col2:
+                    st.markdown(
+                        f"**✨ Unlocked Arts ({build['total_arts']})**")
+
+                    # Group arts by element, in display order (arts are
+                    # already sorted by name)
+                    arts_by_element = {element: [] for element in ELEMENT_ORDER}
+                    for art_name in build['unlocked_arts']:
+                        art_data = game_data.arts_map.get(art_name)
+                        if art_data and art_data.element in arts_by_element:
+                            arts_by_element[art_data.element].append(art_data)
+
+                    # Build the HTML content separately
+                    html_parts = ['<div>']
+                    for element, element_arts in arts_by_element.items():
+                        color = ELEMENT_COLORS.get(element, "#888888")
+                        for art_data in element_arts:
+                            html_parts.append(ART_LINE_TEMPLATE.format(
+                                color=color,
+                                marker="⭐" if art_data.name in selected_arts_set else "•",
+                                name=art_data.name,
+                                effect=art_data.effect,
+                                range=art_data.range,
+                                description=art_data.description))
+                    html_parts.append('</div>')
+
+                    # Render the HTML
+                    st.markdown(''.join(html_parts), unsafe_allow_html=True)
+    elif builds is not None:
+        st.error(
+            "❌ No valid builds found with the selected quartz and arts.")
+        st.info("Try adding more quartz or adjusting your desired arts.")
+
+
 # Main content
 tab1, tab2 = st.tabs(["🎯 Build Finder", "ℹ️ About"])
 
@@ -452,15 +840,16 @@ with tab1:
         # Row 1: Character and Max Builds
         col1, col2 = st.columns(2)
         with col1:
-            characters = sorted([char.name for char in game_data.characters])
             selected_char = st.selectbox(
                 "Character",
-                options=characters,
-                index=characters.index(st.session_state.selected_character)
+                options=game_indices.character_names,
+                index=game_indices.character_index.get(
+                    st.session_state.selected_character, 0
+                )
             )
             if selected_char != st.session_state.selected_character:
                 st.session_state.selected_character = selected_char
-                auto_save_if_enabled()
+                mark_settings_dirty()
                 st.rerun()
 
         with col2:
@@ -473,7 +862,7 @@ with tab1:
             )
             if max_builds != st.session_state.max_builds:
                 st.session_state.max_builds = max_builds
-                auto_save_if_enabled()
+                mark_settings_dirty()
         
         # Parallel processing option
         use_parallel = st.checkbox(
@@ -483,7 +872,7 @@ with tab1:
         )
         if use_parallel != st.session_state.use_parallel:
             st.session_state.use_parallel = use_parallel
-            auto_save_if_enabled()
+            mark_settings_dirty()
         
         # Filter option for prioritized quartz
         if st.session_state.prioritized_quartz:
@@ -494,7 +883,7 @@ with tab1:
             )
             if filter_builds != st.session_state.filter_without_all_prioritized:
                 st.session_state.filter_without_all_prioritized = filter_builds
-                auto_save_if_enabled()
+                mark_settings_dirty()
 
         # Quartz selection
         st.markdown(
@@ -504,35 +893,40 @@ with tab1:
         with col1:
             selected_quartz = st.multiselect(
                 "Select quartz",
-                options=sorted(game_data.quartz_map.keys()),
-                default=st.session_state.selected_quartz,
+                options=game_indices.quartz_names,
+                # Drop saved names that are no longer in the game data
+                default=[q for q in st.session_state.selected_quartz
+                         if q in game_data.quartz_map],
                 label_visibility="collapsed"
             )
             # Update session state and rerun if changed
             if selected_quartz != st.session_state.selected_quartz:
                 st.session_state.selected_quartz = selected_quartz
                 # Remove any prioritized quartz that are no longer selected
+                new_quartz_set = set(selected_quartz)
                 st.session_state.prioritized_quartz = [
                     q for q in st.session_state.prioritized_quartz
-                    if q in selected_quartz
+                    if q in new_quartz_set
                 ]
-                auto_save_if_enabled()
+                mark_settings_dirty()
                 st.rerun()
 
         with col2:
             st.write("")  # Spacing
             if st.button("All", key="select_all_quartz", use_container_width=True):
-                st.session_state.selected_quartz = sorted(
-                    list(game_data.quartz_map.keys()))
-                auto_save_if_enabled()
+                st.session_state.selected_quartz = list(game_indices.quartz_names)
+                mark_settings_dirty()
                 st.rerun()
             if st.button("Clear", key="clear_quartz", use_container_width=True):
                 st.session_state.selected_quartz = []
                 st.session_state.prioritized_quartz = []
-                auto_save_if_enabled()
+                mark_settings_dirty()
                 st.rerun()
 
-        st.caption(f"Selected: {len(st.session_state.selected_quartz)} quartz")
+        # Selection is settled for this rerun (changes rerun above), so the
+        # set is shared by the prioritized filter and the search
+        selected_quartz_set = frozenset(st.session_state.selected_quartz)
+        st.caption(f"Selected: {len(selected_quartz_set)} quartz")
 
         # Prioritized Quartz selection
         if st.session_state.selected_quartz:
@@ -544,20 +938,21 @@ with tab1:
                 prioritized_quartz = st.multiselect(
                     "Select prioritized quartz",
                     options=sorted(st.session_state.selected_quartz),
-                    default=st.session_state.prioritized_quartz,
+                    default=[q for q in st.session_state.prioritized_quartz
+                             if q in selected_quartz_set],
                     label_visibility="collapsed"
                 )
                 # Update session state and rerun if changed
                 if prioritized_quartz != st.session_state.prioritized_quartz:
                     st.session_state.prioritized_quartz = prioritized_quartz
-                    auto_save_if_enabled()
+                    mark_settings_dirty()
                     st.rerun()
 
             with col2:
                 st.write("")  # Spacing
                 if st.button("Clear", key="clear_prioritized", use_container_width=True):
                     st.session_state.prioritized_quartz = []
-                    auto_save_if_enabled()
+                    mark_settings_dirty()
                     st.rerun()
 
             st.caption(
@@ -571,290 +966,129 @@ with tab1:
         with col1:
             selected_arts = st.multiselect(
                 "Select arts",
-                options=sorted(game_data.arts_map.keys()),
-                default=st.session_state.selected_arts,
+                options=game_indices.art_names,
+                default=[a for a in st.session_state.selected_arts
+                         if a in game_data.arts_map],
                 label_visibility="collapsed"
             )
             # Update session state and rerun if changed
             if selected_arts != st.session_state.selected_arts:
                 st.session_state.selected_arts = selected_arts
-                auto_save_if_enabled()
+                mark_settings_dirty()
                 st.rerun()
 
         with col2:
             st.write("")  # Spacing
             if st.button("All", key="select_all_arts", use_container_width=True):
-                st.session_state.selected_arts = sorted(
-                    list(game_data.arts_map.keys()))
-                auto_save_if_enabled()
+                st.session_state.selected_arts = list(game_indices.art_names)
+                mark_settings_dirty()
                 st.rerun()
             if st.button("Clear", key="clear_arts", use_container_width=True):
                 st.session_state.selected_arts = []
-                auto_save_if_enabled()
+                mark_settings_dirty()
                 st.rerun()
 
         st.caption(f"Selected: {len(st.session_state.selected_arts)} arts")
 
+    # Key of the current inputs; results are only shown if they match it
+    prioritized_set = set(st.session_state.prioritized_quartz)
+    cache_key = generate_cache_key(
+        st.session_state.selected_character,
+        selected_quartz_set,
+        st.session_state.selected_arts,
+        st.session_state.max_builds,
+        prioritized_set,
+        st.session_state.filter_without_all_prioritized
+    )
+
     # Run solver button
     if st.button("🔍 Find Builds", type="primary", use_container_width=True):
+        # Persist pending settings before the (possibly long) search
+        flush_settings_if_dirty()
+
+        # Arts needing an element no selected quartz provides can't be unlocked
+        unreachable_arts = find_unreachable_arts(
+            st.session_state.selected_arts, selected_quartz_set)
+
         if not st.session_state.selected_arts:
             st.error("Please select at least one desired art!")
         elif not st.session_state.selected_quartz:
             st.error("Please select at least one quartz!")
+        elif unreachable_arts:
+            # No build can unlock these, so skip the search entirely
+            st.warning(
+                "Cannot reach with the selected quartz: "
+                + ", ".join(unreachable_arts))
         else:
-            # Generate cache key
             character = game_data.get_character(
                 st.session_state.selected_character)
-            quartz_set = set(st.session_state.selected_quartz)
-            prioritized_set = set(st.session_state.prioritized_quartz)
-
-            cache_key = generate_cache_key(
-                st.session_state.selected_character,
-                quartz_set,
-                st.session_state.selected_arts,
-                st.session_state.max_builds,
-                prioritized_set
-            )
-
-            # Try to load from cache
-            builds = load_cached_results(cache_key)
-
-            if builds is not None:
-                st.info(f"✅ Loaded {len(builds)} builds from cache!")
-            else:
-                # Create placeholders for progress updates
-                progress_placeholder = st.empty()
-                spinner_placeholder = st.empty()
-
-                with spinner_placeholder:
-                    with st.spinner("Searching for builds..."):
-                        finder = BuildFinder(
-                            character,
-                            quartz_set,
-                            st.session_state.selected_arts,
-                            game_data,
-                            max_builds=st.session_state.max_builds,
-                            prioritized_quartz=prioritized_set,
-                            filter_without_all_prioritized=st.session_state.filter_without_all_prioritized
-                        )
-
-                        # Create a callback to update progress
-                        def progress_callback():
-                            progress_placeholder.info(
-                                f"🔍 {finder.combinations_checked:,} combinations checked, "
-                                f"{len(finder.valid_builds)} valid builds so far..."
+            quartz_set = selected_quartz_set
+
+            # Same inputs as the results already on screen: keep them, along
+            # with the page being viewed
+            if not (cache_key == st.session_state.get('last_builds_key')
+                    and st.session_state.get('last_builds') is not None):
+                # Try to load from cache
+                builds = load_cached_results(cache_key)
+
+                if builds is not None:
+                    st.info(f"✅ Loaded {len(builds)} builds from cache!")
+                else:
+                    # Only load the solver when a search actually runs
+                    from solver import BuildFinder
+
+                    # Create placeholders for progress updates
+                    progress_placeholder = st.empty()
+                    spinner_placeholder = st.empty()
+
+                    with spinner_placeholder:
+                        with st.spinner("Searching for builds..."):
+                            finder = BuildFinder(
+                                character,
+                                quartz_set,
+                                st.session_state.selected_arts,
+                                game_data,
+                                max_builds=st.session_state.max_builds,
+                                prioritized_quartz=prioritized_set,
+                                filter_without_all_prioritized=st.session_state.filter_without_all_prioritized
                             )
 
-                        finder.progress_callback = progress_callback
+                            # Create a callback to update progress, throttled so
+                            # UI updates don't slow down the search
+                            last_progress_update = [0.0]
+
+                            def progress_callback():
+                                now = time.monotonic()
+                                if now - last_progress_update[0] < PROGRESS_UPDATE_INTERVAL:
+                                    return
+                                last_progress_update[0] = now
+                                progress_placeholder.info(
+                                    f"🔍 {finder.combinations_checked:,} combinations checked, "
+                                    f"{len(finder.valid_builds)} valid builds so far..."
+                                )
+
+                            finder.progress_callback = progress_callback
                         
-                        # Use parallel or single-threaded based on user preference
-                        if st.session_state.use_parallel:
-                            builds = finder.find_builds_parallel(verbose=False)
-                        else:
-                            builds = finder.find_builds(verbose=False)
-
-                # Clear progress messages
-                progress_placeholder.empty()
-                spinner_placeholder.empty()
-
-                # Save to cache
-                if builds:
-                    save_cached_results(cache_key, builds)
-
-            if builds:
-                st.success(f"✅ Found {len(builds)} valid builds!")
-
-                # Display builds
-                for i, build in enumerate(builds):
-                    with st.expander(
-                        f"Build #{i+1} - {build['total_arts']} arts unlocked",
-                        expanded=(i == 0)
-                    ):
-                        # Reconstruct tree to calculate elements per line
-                        from tree_structure import OrbmentTree
-                        tree = OrbmentTree(character)
-                        for placement in build['placements']:
-                            for node in tree.all_nodes:
-                                if (node.line_index == placement['line_index'] and
-                                        node.slot_index == placement['slot_index']):
-                                    node.placed_quartz = placement['quartz']
-                                    break
-
-                        col1, col2 = st.columns([1, 1])
-
-                        with col1:
-                            st.markdown("**🔮 Quartz Setup**")
-
-                            # Inject CSS for quartz tooltips (reuse art-tooltip class)
-                            st.markdown("""
-                            <style>
-                            .quartz-tooltip {
-                                position: relative;
-                                display: inline-block;
-                                cursor: help;
-                                margin: 0 4px;
-                            }
-                            .quartz-tooltip .tooltiptext-quartz {
-                                visibility: hidden;
-                                width: 250px;
-                                background-color: #555;
-                                color: #fff;
-                                text-align: left;
-                                border-radius: 6px;
-                                padding: 8px;
-                                position: absolute;
-                                z-index: 1000;
-                                top: 0;
-                                left: 100%;
-                                margin-left: 10px;
-                                opacity: 0;
-                                transition: opacity 0.3s;
-                                font-size: 0.85em;
-                                line-height: 1.4;
-                                white-space: pre-wrap;
-                            }
-                            .quartz-tooltip:hover .tooltiptext-quartz {
-                                visibility: visible;
-                                opacity: 1;
-                            }
-                            </style>
-                            """, unsafe_allow_html=True)
-
-                            # Use centralized element colors
-                            element_colors = ELEMENT_COLORS
-
-                            # Group by line
-                            by_line = {}
-                            for placement in build['placements']:
-                                line_idx = placement['line_index']
-                                if line_idx not in by_line:
-                                    by_line[line_idx] = []
-                                by_line[line_idx].append(placement)
-
-                            # Get all paths for element calculation
-                            paths = tree.get_all_paths()
-
-                            for line_idx in sorted(by_line.keys()):
-                                if line_idx == -1:
-                                    st.markdown("**Shared:**")
-                                else:
-                                    # Calculate elements for this line
-                                    if line_idx < len(paths):
-                                        line_elements = tree.calculate_elements_for_path(
-                                            paths[line_idx], game_data)
-                                        elem_str = ", ".join([f"{e}: {v}" for e, v in sorted(
-                                            line_elements.items())]) if line_elements else "None"
-                                        st.markdown(
-                                            f"**Line {line_idx + 1}:** `{elem_str}`")
-
-                                # Show quartz with colors and tooltips
-                                quartz_html = ""
-                                for idx, placement in enumerate(by_line[line_idx]):
-                                    quartz_name = placement['quartz']
-                                    quartz_data = game_data.quartz_map.get(
-                                        quartz_name)
-
-                                    if quartz_data:
-                                        # Get color based on quartz_element
-                                        color = element_colors.get(
-                                            quartz_data.quartz_element, "#888888")
-
-                                        # Create tooltip with description
-                                        tooltip = quartz_data.description if quartz_data.description else "No description"
-
-                                        # Add arrow between quartz
-                                        if idx > 0:
-                                            quartz_html += '<span style="color: #888; margin: 0 4px;">→</span>'
-
-                                        # Add quartz with tooltip
-                                        quartz_html += f'<span class="quartz-tooltip" style="color: {color}; font-size: 0.9em;">{quartz_name}<span class="tooltiptext-quartz">{tooltip}</span></span>'
-                                    else:
-                                        if idx > 0:
-                                            quartz_html += ' → '
-                                        quartz_html += quartz_name
-
-                                st.markdown(
-                                    quartz_html, unsafe_allow_html=True)
-
-                        with col2:
-                            st.markdown(
-                                f"**✨ Unlocked Arts ({build['total_arts']})**")
-
-                            # Use centralized element colors
-                            element_colors = ELEMENT_COLORS
-
-                            # Group arts by element and sort
-                            arts_by_element = {}
-                            for art_name in sorted(build['unlocked_arts']):
-                                art_data = game_data.arts_map.get(art_name)
-                                if art_data:
-                                    element = art_data.element
-                                    if element not in arts_by_element:
-                                        arts_by_element[element] = []
-                                    arts_by_element[element].append(art_data)
-
-                            # Display arts with colors and custom CSS tooltips
-                            # First, inject the CSS styles
-                            st.markdown("""
-                            <style>
-                            .art-line {
-                                display: block;
-                                line-height: 1.6;
-                            }
-                            .art-tooltip {
-                                position: relative;
-                                display: inline-block;
-                                cursor: help;
-                            }
-                            .art-tooltip .tooltiptext {
-                                visibility: hidden;
-                                width: 300px;
-                                background-color: #555;
-                                color: #fff;
-                                text-align: left;
-                                border-radius: 6px;
-                                padding: 8px;
-                                position: absolute;
-                                z-index: 1000;
-                                top: 0;
-                                left: 100%;
-                                margin-left: 10px;
-                                opacity: 0;
-                                transition: opacity 0.3s;
-                                font-size: 0.85em;
-                                line-height: 1.4;
-                                white-space: pre-wrap;
-                            }
-                            .art-tooltip:hover .tooltiptext {
-                                visibility: visible;
-                                opacity: 1;
-                            }
-                            </style>
-                            """, unsafe_allow_html=True)
-
-                            # Build the HTML content separately
-                            html_output = '<div>'
-                            for element in ["Earth", "Water", "Fire", "Wind", "Time", "Space", "Mirage"]:
-                                if element in arts_by_element:
-                                    for art_data in arts_by_element[element]:
-                                        marker = "⭐" if art_data.name in st.session_state.selected_arts else "•"
-                                        color = element_colors.get(
-                                            element, "#888888")
-
-                                        # Create tooltip content
-                                        tooltip_content = f"{art_data.effect} | {art_data.range}\n{art_data.description}"
-
-                                        # Wrap in inline tooltip, then in block line
-                                        html_output += f'<div class="art-line"><span class="art-tooltip" style="color: {color}; font-size: 0.9em;">{marker} {art_data.name}<span class="tooltiptext">{tooltip_content}</span></span></div>'
-
-                            html_output += '</div>'
-
-                            # Render the HTML
-                            st.markdown(html_output, unsafe_allow_html=True)
-            else:
-                st.error(
-                    "❌ No valid builds found with the selected quartz and arts.")
-                st.info("Try adding more quartz or adjusting your desired arts.")
+                            # Use parallel or single-threaded based on user preference
+                            if st.session_state.use_parallel:
+                                builds = finder.find_builds_parallel(verbose=False)
+                            else:
+                                builds = finder.find_builds(verbose=False)
+
+                    # Clear progress messages
+                    progress_placeholder.empty()
+                    spinner_placeholder.empty()
+
+                    # Save to cache
+                    if builds:
+                        save_cached_results(cache_key, builds)
+
+                st.session_state.last_builds = builds
+                st.session_state.last_builds_key = cache_key
+                st.session_state.results_page = 1
+
+    # Show the latest results (kept across reruns so they can be paged)
+    render_results(cache_key)
 
 with tab2:
     st.header("About")
@@ -900,3 +1134,6 @@ with tab2:
 st.divider()
 st.caption(
     f"Settings: {st.session_state.settings_name} | Auto-save: {'✅' if st.session_state.auto_save else '❌'}")
+
+# Write any settings changes made during this run
+flush_settings_if_dirty()
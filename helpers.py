@@ -2,16 +2,27 @@
 Trails FC Arts Simulator - Data Classes and Helper Methods
 """
 import json
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Set
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from collections import defaultdict
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib json module
+
 
 # ============================================================================
 # Data Classes
 # ============================================================================
 
-@dataclass
+# Slotted dataclasses need Python 3.10+. Applying slots conditionally keeps
+# Python 3.9 (the README minimum) working; there instances keep a __dict__
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Quartz:
     """Represents a quartz with elemental values"""
     name: str
@@ -21,6 +32,10 @@ class Quartz:
     effects: Optional[str] = None
     description: Optional[str] = None
     quartz_element: Optional[str] = None  # Single element for restriction purposes
+    # Element bitmasks, filled in by GameData once elements are indexed:
+    # elements provided, and elements counted for slot restrictions
+    element_mask: int = field(default=0, repr=False, compare=False)
+    restriction_element_mask: int = field(default=0, repr=False, compare=False)
 
     def has_element(self, element: str) -> bool:
         """Check if quartz provides a specific element (for art unlocking)"""
@@ -37,8 +52,12 @@ class Quartz:
         # Fallback for quartz without quartz_element defined yet
         return self.has_element(restriction)
 
+    def matches_restriction_mask(self, restriction_mask: int) -> bool:
+        """Bitmask form of matches_restriction (see Slot.restriction_mask)"""
+        return bool(self.restriction_element_mask & restriction_mask)
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Art:
     """Represents an art with requirements"""
     name: str
@@ -50,12 +69,14 @@ class Art:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Slot:
     """Represents a single slot in an orbment line"""
     index: int
     restriction: Optional[str]  # Element restriction (e.g., "Time")
     shared: bool  # Whether this slot is shared between lines
+    # Bit of the restriction element, filled in by GameData (0 if unrestricted)
+    restriction_mask: int = field(default=0, repr=False, compare=False)
 
     def can_accept(self, quartz: Optional[Quartz]) -> bool:
         """Check if this slot can accept a specific quartz"""
@@ -64,10 +85,13 @@ class Slot:
         if self.restriction is None:
             return True  # No restriction
         # Check if quartz has the required element
+        if self.restriction_mask:
+            return bool(quartz.element_mask & self.restriction_mask)
+        # Restriction without an element bit (not indexed by GameData)
         return quartz.has_element(self.restriction)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Line:
     """Represents an orbment line with slots"""
     name: str
@@ -91,7 +115,7 @@ class Line:
         return [i for i, slot in enumerate(self.slots) if slot.shared]
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Character:
     """Represents a character with multiple lines"""
     name: str
@@ -106,8 +130,39 @@ class Character:
 class ElementCalculator:
     """Handles element calculations for quartz combinations"""
 
-    def __init__(self, quartz_map: Dict[str, Quartz]):
+    def __init__(self, quartz_map: Dict[str, Quartz],
+                 element_index: Dict[str, int]):
         self.quartz_map = quartz_map
+        self.element_index = element_index
+
+        # Dense per-quartz element vectors, indexed by element_index
+        self.quartz_vectors: Dict[str, Tuple[int, ...]] = {
+            name: self.to_vector(quartz.elements)
+            for name, quartz in quartz_map.items()
+        }
+
+    def to_vector(self, elements: Dict[str, int]) -> Tuple[int, ...]:
+        """Convert an element -> value dict into a dense element vector"""
+        vector = [0] * len(self.element_index)
+        for elem, value in elements.items():
+            vector[self.element_index[elem]] += value
+        return tuple(vector)
+
+    def calculate_element_vector(self, quartz_names: Iterable[str]) -> List[int]:
+        """
+        Calculate total elemental values for a set of quartz as a vector.
+
+        Args:
+            quartz_names: Quartz names (each counted once per occurrence)
+
+        Returns:
+            List of totals indexed by element_index
+        """
+        totals = [0] * len(self.element_index)
+        for name in quartz_names:
+            for i, value in enumerate(self.quartz_vectors[name]):
+                totals[i] += value
+        return totals
 
     def calculate_elements(self, quartz_names: Set[str]) -> Dict[str, int]:
         """
@@ -126,6 +181,21 @@ class ElementCalculator:
                 elements[elem] += value
         return dict(elements)
 
+    def get_required_vector(self, arts: List[Art]) -> List[int]:
+        """
+        Get the combined required elements for multiple arts as a vector.
+
+        Args:
+            arts: List of arts
+
+        Returns:
+            List of maximum required values indexed by element_index
+        """
+        required = [0] * len(self.element_index)
+        for art in arts:
+            required = list(map(max, required, self.to_vector(art.requirements)))
+        return required
+
     def get_required_elements(self, arts: List[Art]) -> Dict[str, int]:
         """
         Get the combined required elements for multiple arts.
@@ -137,11 +207,9 @@ class ElementCalculator:
         Returns:
             Dictionary mapping element names to maximum required values
         """
-        required = defaultdict(int)
-        for art in arts:
-            for elem, value in art.requirements.items():
-                required[elem] = max(required[elem], value)
-        return dict(required)
+        required = self.get_required_vector(arts)
+        return {elem: required[i] for elem, i in self.element_index.items()
+                if required[i] > 0}
 
 
 # ============================================================================
@@ -157,48 +225,128 @@ class GameData:
         self.characters: List[Character] = []
         self.element_calc: ElementCalculator = None
 
+        # Canonical element ordering used by the element vectors
+        self.elements: Tuple[str, ...] = ()
+        self.element_index: Dict[str, int] = {}
+        self.element_bits: Dict[str, int] = {}
+        # One bit per quartz in load order (not BuildFinder's search order, so
+        # these masks must not be mixed with solver masks) and, per element,
+        # the mask of quartz providing it
+        self.quartz_load_bits: Dict[str, int] = {}
+        self.quartz_by_element: Dict[str, int] = {}
+        # Art requirements as sparse (element_index, value) pairs
+        self.art_requirements: Dict[str, Tuple[Tuple[int, int], ...]] = {}
+
         self.load_data()
 
     def load_data(self):
         """Load all game data from JSON files"""
-        # Load quartz
-        with open('data/quartz.json', 'r') as f:
-            quartz_data = json.load(f)
-            for q in quartz_data['quartz']:
-                quartz = Quartz(**q)
-                self.quartz_map[quartz.name] = quartz
-
-        # Load arts
-        with open('data/arts.json', 'r') as f:
-            arts_data = json.load(f)
-            for a in arts_data['arts']:
-                art = Art(**a)
-                self.arts_map[art.name] = art
-
-        # Load characters
-        with open('data/characters.json', 'r') as f:
-            char_data = json.load(f)
-            for c in char_data['characters']:
-                lines = []
-                for line_data in c['lines']:
-                    slots = [Slot(**slot_data)
-                             for slot_data in line_data['slots']]
-                    line = Line(
-                        name=line_data['name'],
-                        color=line_data['color'],
-                        slots=slots
-                    )
-                    lines.append(line)
-
-                character = Character(
-                    name=c['name'],
-                    description=c['description'],
-                    lines=lines
-                )
-                self.characters.append(character)
+        self._load_quartz()
+        self._load_arts()
+        self._load_characters()
+
+        # Index every element that appears in quartz, art or slot data
+        elements = set()
+        for quartz in self.quartz_map.values():
+            elements.update(quartz.elements)
+            if quartz.quartz_element is not None:
+                elements.add(quartz.quartz_element)
+        for art in self.arts_map.values():
+            elements.update(art.requirements)
+        for character in self.characters:
+            for line in character.lines:
+                elements.update(slot.restriction for slot in line.slots
+                                if slot.restriction)
+        self.elements = tuple(sorted(elements))
+        self.element_index = {elem: i for i, elem in enumerate(self.elements)}
+        self.element_bits = {elem: 1 << i for i, elem in enumerate(self.elements)}
+
+        # Bitmask forms of the element checks used when placing quartz
+        self.quartz_by_element = {elem: 0 for elem in self.elements}
+        for i, quartz in enumerate(self.quartz_map.values()):
+            bit = 1 << i
+            self.quartz_load_bits[quartz.name] = bit
+            for elem, value in quartz.elements.items():
+                if value > 0:
+                    self.quartz_by_element[elem] |= bit
+
+            quartz.element_mask = self.elements_to_mask(
+                elem for elem, value in quartz.elements.items() if value > 0)
+            if quartz.quartz_element is not None:
+                quartz.restriction_element_mask = self.element_bits.get(
+                    quartz.quartz_element, 0)
+            else:
+                quartz.restriction_element_mask = quartz.element_mask
+        for character in self.characters:
+            for line in character.lines:
+                for slot in line.slots:
+                    if slot.restriction:
+                        slot.restriction_mask = self.element_bits[slot.restriction]
+
+        self.art_requirements = {
+            name: tuple((self.element_index[elem], value)
+                        for elem, value in art.requirements.items())
+            for name, art in self.arts_map.items()
+        }
 
         # Initialize element calculator
-        self.element_calc = ElementCalculator(self.quartz_map)
+        self.element_calc = ElementCalculator(self.quartz_map, self.element_index)
+
+    @staticmethod
+    def _read_json(path: str) -> dict:
+        """Parse a data file (orjson when available)"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def _load_quartz(self):
+        """Load quartz from data/quartz.json"""
+        for q in self._read_json('data/quartz.json')['quartz']:
+            quartz = Quartz(**q)
+            self.quartz_map[quartz.name] = quartz
+
+    def _load_arts(self):
+        """Load arts from data/arts.json"""
+        for a in self._read_json('data/arts.json')['arts']:
+            art = Art(**a)
+            self.arts_map[art.name] = art
+
+    def _load_characters(self):
+        """Load characters from data/characters.json"""
+        for c in self._read_json('data/characters.json')['characters']:
+            lines = []
+            for line_data in c['lines']:
+                slots = [Slot(**slot_data)
+                         for slot_data in line_data['slots']]
+                line = Line(
+                    name=line_data['name'],
+                    color=line_data['color'],
+                    slots=slots
+                )
+                lines.append(line)
+
+            character = Character(
+                name=c['name'],
+                description=c['description'],
+                lines=lines
+            )
+            self.characters.append(character)
+
+    def elements_to_mask(self, elements: Iterable[str]) -> int:
+        """Combine element names into a bitmask of element_bits"""
+        mask = 0
+        for elem in elements:
+            mask |= self.element_bits.get(elem, 0)
+        return mask
+
+    def quartz_to_mask(self, quartz_names: Iterable[str]) -> int:
+        """Combine quartz names into a bitmask of quartz_load_bits"""
+        mask = 0
+        for name in quartz_names:
+            mask |= self.quartz_load_bits.get(name, 0)
+        return mask
 
     def get_character(self, name: str) -> Optional[Character]:
         """Get character by name"""
@@ -5,7 +5,7 @@ This module handles the ordering constraints that eliminate redundant permutatio
 in the search space while maintaining correctness.
 """
 
-from typing import Set, Dict
+from typing import Set, Dict, Optional
 
 
 class LexicographicOrdering:
@@ -81,42 +81,36 @@ class LexicographicOrdering:
         line_idx = current_node.line_index
         return self.last_quartz_index_per_line.get(line_idx, -1)
 
-    def should_skip_quartz(self, current_node, quartz_idx: int) -> bool:
-        """
-        Check if a quartz should be skipped due to ordering constraints.
-
-        Args:
-            current_node: The slot node being populated
-            quartz_idx: Index of the quartz in the sorted list
-
-        Returns:
-            True if this quartz violates ordering and should be skipped
-        """
-        if not self.should_apply_ordering(current_node):
-            return False
-
-        min_index = self.get_minimum_index(current_node)
-        return quartz_idx <= min_index
-
-    def update_last_index(self, current_node, quartz_idx: int):
+    def update_last_index(self, current_node, quartz_idx: int) -> Optional[int]:
         """
         Update the last used quartz index for the current line.
 
         Args:
             current_node: The slot node that was just populated
             quartz_idx: Index of the quartz that was placed
+
+        Returns:
+            The line's previous index (None if it had none), for
+            restore_last_index when backtracking
         """
         if self.should_apply_ordering(current_node):
             line_idx = current_node.line_index
+            previous = self.last_quartz_index_per_line.get(line_idx)
             self.last_quartz_index_per_line[line_idx] = quartz_idx
+            return previous
+        return None
 
-    def copy(self) -> 'LexicographicOrdering':
+    def restore_last_index(self, current_node, previous: Optional[int]):
         """
-        Create a copy of this ordering state for branching.
+        Undo update_last_index when backtracking out of a placement.
 
-        Returns:
-            New LexicographicOrdering instance with copied state
+        Args:
+            current_node: The slot node being cleared
+            previous: Value returned by the matching update_last_index call
         """
-        new_ordering = LexicographicOrdering(self.prioritized_quartz)
-        new_ordering.last_quartz_index_per_line = self.last_quartz_index_per_line.copy()
-        return new_ordering
+        if self.should_apply_ordering(current_node):
+            line_idx = current_node.line_index
+            if previous is None:
+                self.last_quartz_index_per_line.pop(line_idx, None)
+            else:
+                self.last_quartz_index_per_line[line_idx] = previous
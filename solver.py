@@ -36,11 +36,13 @@ def _worker_search_subtree(args: Tuple) -> List[Dict]:
     
     # Place the first quartz
     first_node.placed_quartz = first_quartz
+    finder._prepare_search(tree)
+    finder._update_line_totals(0, first_quartz, 1)
     
     # Calculate remaining quartz after first placement
     line_placements = {}
     remaining = finder._calculate_remaining_quartz(
-        first_quartz, quartz_pool, first_node, line_placements)
+        first_quartz, finder.relevant_quartz, first_node, line_placements)
     
     # Create ordering and update for first placement
     ordering = LexicographicOrdering(prioritized_quartz)
@@ -79,8 +81,56 @@ class BuildFinder:
         self.required_elements = game_data.element_calc.get_required_elements(
             desired_art_objs)
 
+        # Sparse (element_index, value) requirements of each desired art,
+        # checked directly at the leaves instead of evaluating every art
+        self.desired_requirements = [game_data.art_requirements[name]
+                                     for name in desired_arts]
+
+        # Give each quartz a bit in search order (prioritized first, then
+        # alphabetical), so the set bits of an availability mask enumerate in
+        # the same order as LexicographicOrdering.get_sorted_available_quartz
+        # (independent of GameData.quartz_load_bits, which follow load order)
+        self.quartz_names = LexicographicOrdering(
+            self.prioritized_quartz).get_sorted_available_quartz(quartz_pool)
+        self.quartz_bits = {name: 1 << i
+                            for i, name in enumerate(self.quartz_names)}
+
+        # Masks of quartz sharing a family, and of blades/shields
+        self.family_masks = {}
+        self.type_masks = {'Blade': 0, 'Shield': 0}
+        for name, bit in self.quartz_bits.items():
+            quartz = game_data.quartz_map[name]
+            self.family_masks[quartz.family] = self.family_masks.get(
+                quartz.family, 0) | bit
+            if quartz.type in self.type_masks:
+                self.type_masks[quartz.type] |= bit
+
         # Use all quartz from the pool (user has already pre-filtered)
-        self.relevant_quartz = quartz_pool
+        self.relevant_quartz = (1 << len(self.quartz_names)) - 1
+
+        # Masks of quartz allowed in a slot, keyed by the slot's restriction
+        self._allowed_quartz_masks: Dict = {}
+
+        # Running element totals per line, set up by _init_line_totals
+        self.line_totals: List[List[int]] = []
+        self._node_line_totals: List[List[List[int]]] = []
+        self._line_bounds: List[List[List[int]]] = []
+
+        # Per-node lookups (indexed like tree.all_nodes), set up by
+        # _prepare_search
+        self._node_allowed: List[int] = []
+        self._node_ordered: List[bool] = []
+
+        # best_gain[e][k]: sum of the k largest values of element e in the
+        # pool, an upper bound on what k more quartz can add to a line
+        self._best_gain: List[List[int]] = []
+        for elem_idx in range(len(game_data.element_index)):
+            values = sorted((game_data.element_calc.quartz_vectors[name][elem_idx]
+                             for name in self.quartz_names), reverse=True)
+            prefix = [0]
+            for value in values:
+                prefix.append(prefix[-1] + value)
+            self._best_gain.append(prefix)
 
         # Results storage
         self.valid_builds = []
@@ -95,34 +145,148 @@ class BuildFinder:
         print(f"BUILD FINDER INITIALIZED")
         print(f"{'='*50}")
         print(f"Available quartz: {len(self.quartz_pool)}")
-        print(f"Relevant quartz: {len(self.relevant_quartz)}")
+        print(f"Relevant quartz: {bin(self.relevant_quartz).count('1')}")
         print(f"Required elements: {self.required_elements}")
         print(f"Max builds to find: {self.max_builds}")
 
-    def _calculate_remaining_quartz(self, used_quartz: str, available: Set[str],
-                                    current_node: SlotNode, line_placements: Dict) -> Set[str]:
+    def _get_allowed_quartz(self, node: SlotNode) -> int:
+        """
+        Get the mask of pooled quartz that can be placed in a node.
+
+        Nodes with the same restriction share one cached mask.
+
+        Args:
+            node: The slot node being populated
+
+        Returns:
+            Bitmask of quartz that respect the node's restriction
+        """
+        allowed = self._allowed_quartz_masks.get(node.restriction)
+        if allowed is None:
+            allowed = 0
+            for name, bit in self.quartz_bits.items():
+                if node.can_place_quartz(name, self.game_data):
+                    allowed |= bit
+            self._allowed_quartz_masks[node.restriction] = allowed
+        return allowed
+
+    def _prepare_search(self, tree: OrbmentTree):
+        """
+        Precompute flat per-node data and reset the line totals for a search.
+
+        The recursion reads the allowed-quartz mask and whether lexicographic
+        ordering applies from these lists instead of re-deriving them from
+        the node objects on every visit.
+
+        Args:
+            tree: The orbment tree being populated (assumed empty)
+        """
+        ordering = LexicographicOrdering(self.prioritized_quartz)
+        self._node_allowed = [self._get_allowed_quartz(node)
+                              for node in tree.all_nodes]
+        self._node_ordered = [ordering.should_apply_ordering(node)
+                              for node in tree.all_nodes]
+        self._init_line_totals(tree)
+
+    def _init_line_totals(self, tree: OrbmentTree):
+        """
+        Reset the running element totals for a search over a tree.
+
+        Each line (root-to-leaf path) keeps an element vector that is
+        updated as quartz are placed and removed, so complete builds can be
+        validated without re-summing every line.
+
+        Args:
+            tree: The orbment tree being populated (assumed empty)
+        """
+        num_elements = len(self.game_data.element_index)
+        paths = tree.get_all_paths()
+        self.line_totals = [[0] * num_elements for _ in paths]
+
+        # For each node (by index in tree.all_nodes), the totals of every
+        # line it belongs to; the shared root belongs to all of them
+        self._node_line_totals = [
+            [totals for path, totals in zip(paths, self.line_totals)
+             if node in path]
+            for node in tree.all_nodes
+        ]
+
+        # For each node index, the most each line can still gain per element
+        # from the slots not yet filled (nodes are filled in all_nodes order)
+        node_order = {id(node): i for i, node in enumerate(tree.all_nodes)}
+        self._line_bounds = []
+        for node_index in range(len(tree.all_nodes) + 1):
+            bounds = []
+            for path in paths:
+                slots_left = sum(1 for node in path
+                                 if node_order[id(node)] >= node_index)
+                max_k = len(self.quartz_names)
+                bounds.append([gain[min(slots_left, max_k)]
+                               for gain in self._best_gain])
+            self._line_bounds.append(bounds)
+
+    def _can_still_unlock(self, node_index: int) -> bool:
+        """
+        Check whether filling the remaining nodes could still unlock every
+        desired art.
+
+        Uses the per-line upper bounds from _init_line_totals, so a False
+        result is exact: no completion of the current partial build is valid.
+
+        Args:
+            node_index: Index of the next node to fill
+
+        Returns:
+            False if some desired art is out of reach on every line
+        """
+        bounds = self._line_bounds[node_index]
+        for requirements in self.desired_requirements:
+            for totals, bound in zip(self.line_totals, bounds):
+                for elem_idx, value in requirements:
+                    if totals[elem_idx] + bound[elem_idx] < value:
+                        break
+                else:
+                    break  # This line can still reach the art
+            else:
+                return False
+        return True
+
+    def _update_line_totals(self, node_index: int, quartz_name: str, sign: int):
+        """
+        Add (sign=1) or remove (sign=-1) a quartz's elements from the totals
+        of the lines running through a node.
+
+        Args:
+            node_index: Index of the node in tree.all_nodes
+            quartz_name: Quartz placed in (or removed from) the node
+            sign: 1 when placing, -1 when backtracking
+        """
+        vector = self.game_data.element_calc.quartz_vectors[quartz_name]
+        for totals in self._node_line_totals[node_index]:
+            for i, value in enumerate(vector):
+                totals[i] += sign * value
+
+    def _calculate_remaining_quartz(self, used_quartz: str, available: int,
+                                    current_node: SlotNode, line_placements: Dict) -> int:
         """
         Calculate remaining quartz after placing one.
 
         Args:
             used_quartz: The quartz just placed
-            available: Currently available quartz set
+            available: Bitmask of currently available quartz
             current_node: The node where quartz was placed
-            line_placements: Dict tracking blade/shield placements per line {line_idx: {'blade': set(), 'shield': set()}}
+            line_placements: Dict tracking blade/shield placements per line {line_idx: {'blade': mask, 'shield': mask}}
 
         Returns:
-            Set of quartz still available for next placement
+            Bitmask of quartz still available for next placement
         """
-        # Start with available minus the used one
-        remaining = available - {used_quartz}
+        used_bit = self.quartz_bits[used_quartz]
 
         # Get the quartz object
         quartz_obj = self.game_data.quartz_map[used_quartz]
 
-        # Remove all quartz from the same family
-        quartz_family = quartz_obj.family
-        remaining = {q for q in remaining
-                     if self.game_data.quartz_map[q].family != quartz_family}
+        # Remove the used quartz and all quartz from the same family
+        remaining = available & ~(used_bit | self.family_masks[quartz_obj.family])
 
         # Handle blade/shield restrictions per line
         # If node is shared (root), blade/shield don't count toward line restrictions
@@ -131,29 +295,26 @@ class BuildFinder:
 
             # Track what types have been placed on this line
             if line_idx not in line_placements:
-                line_placements[line_idx] = {
-                    'blade': set(), 'shield': set()}
+                line_placements[line_idx] = {'blade': 0, 'shield': 0}
 
             quartz_type = quartz_obj.type
 
             if quartz_type == 'Blade':
                 # Already placed a blade on this line, remove all blades
                 if line_placements[line_idx]['blade']:
-                    remaining = {q for q in remaining
-                                 if self.game_data.quartz_map[q].type != 'Blade'}
-                line_placements[line_idx]['blade'].add(used_quartz)
+                    remaining &= ~self.type_masks['Blade']
+                line_placements[line_idx]['blade'] |= used_bit
 
             elif quartz_type == 'Shield':
                 # Already placed a shield on this line, remove all shields
                 if line_placements[line_idx]['shield']:
-                    remaining = {q for q in remaining
-                                 if self.game_data.quartz_map[q].type != 'Shield'}
-                line_placements[line_idx]['shield'].add(used_quartz)
+                    remaining &= ~self.type_masks['Shield']
+                line_placements[line_idx]['shield'] |= used_bit
 
         return remaining
 
     def _populate_tree_recursive(self, tree: OrbmentTree, node_index: int,
-                                 available_quartz: Set[str], line_placements: Dict,
+                                 available_quartz: int, line_placements: Dict,
                                  ordering: LexicographicOrdering) -> None:
         """
         Recursively populate the tree with quartz.
@@ -161,9 +322,13 @@ class BuildFinder:
         Args:
             tree: The orbment tree to populate
             node_index: Index of current node in tree.all_nodes
-            available_quartz: Set of quartz available for this placement
+            available_quartz: Bitmask of quartz available for this placement
             line_placements: Dict tracking blade/shield placements per line
             ordering: LexicographicOrdering instance tracking ordering constraints
+
+        line_placements and ordering are shared across the whole search:
+        each placement updates them in place and undoes the update when it
+        backtracks.
         """
         # Early exit if we've found enough builds
         if len(self.valid_builds) >= self.max_builds:
@@ -175,11 +340,10 @@ class BuildFinder:
             self.combinations_checked += 1
 
             # Check if it meets requirements
-            # Check if all desired arts are unlocked by any line
-            unlocked_arts = tree.calculate_unlocked_arts(self.game_data)
-
-            # Build is valid if all desired arts are unlocked
-            if all(art in unlocked_arts for art in self.desired_arts):
+            # Build is valid if every desired art is unlocked by some line
+            line_vectors = self.line_totals
+            if all(self._is_unlocked(requirements, line_vectors)
+                   for requirements in self.desired_requirements):
                 # If filter is enabled, also check if all prioritized quartz are present
                 if self.filter_without_all_prioritized and self.prioritized_quartz:
                     used_quartz = {node.placed_quartz for node in tree.all_nodes}
@@ -204,51 +368,116 @@ class BuildFinder:
                     'total_arts': 0  # Will be calculated after search
                 }
                 self.valid_builds.append(build_copy)
-                # print(f"  ✓ Found valid build #{len(self.valid_builds)}")
 
             # Call progress callback if provided (after checking this combination)
             if self.progress_callback and self.combinations_checked % 100 == 0:
                 self.progress_callback()
             return
 
+        # Prune if the desired arts are out of reach from here
+        if not self._can_still_unlock(node_index):
+            return
+
         # Get current node
         current_node = tree.all_nodes[node_index]
 
-        # Sort available quartz for consistent ordering
-        sorted_quartz = ordering.get_sorted_available_quartz(available_quartz)
+        # Quartz that respect this node's restriction
+        allowed_quartz = self._node_allowed[node_index]
+
+        # Highest index excluded by lexicographic ordering (-1 if none)
+        min_index = (ordering.get_minimum_index(current_node)
+                     if self._node_ordered[node_index] else -1)
+
+        # Walk the available bits from lowest to highest; bit order matches
+        # the sorted quartz order, so quartz_idx is the position in that list
+        pending = available_quartz
+        quartz_idx = -1
+        while pending:
+            bit = pending & -pending
+            pending ^= bit
+            quartz_idx += 1
 
-        # Try placing each available quartz that respects restrictions
-        for quartz_idx, quartz_name in enumerate(sorted_quartz):
             # Skip if violates lexicographic ordering
-            if ordering.should_skip_quartz(current_node, quartz_idx):
+            if quartz_idx <= min_index:
                 continue
 
-            if current_node.can_place_quartz(quartz_name, self.game_data):
+            if bit & allowed_quartz:
+                quartz_name = self.quartz_names[bit.bit_length() - 1]
+
                 # Place the quartz
                 current_node.placed_quartz = quartz_name
+                self._update_line_totals(node_index, quartz_name, 1)
 
-                # Calculate remaining quartz for next placement
-                # Make a copy of line_placements for this branch
-                line_placements_copy = {
-                    line: {'blade': types['blade'].copy(
-                    ), 'shield': types['shield'].copy()}
-                    for line, types in line_placements.items()
-                }
+                # Calculate remaining quartz for next placement; the
+                # blade/shield state is updated in place and restored below,
+                # so only this line's entry is copied
+                line_idx = current_node.line_index
+                previous_types = line_placements.get(line_idx)
+                if previous_types is not None:
+                    line_placements[line_idx] = dict(previous_types)
 
                 remaining = self._calculate_remaining_quartz(
-                    quartz_name, available_quartz, current_node, line_placements_copy)
+                    quartz_name, available_quartz, current_node, line_placements)
 
-                # Copy and update ordering state for this branch
-                ordering_copy = ordering.copy()
-                ordering_copy.update_last_index(current_node, quartz_idx)
+                # Update ordering state for this branch
+                previous_index = ordering.update_last_index(
+                    current_node, quartz_idx)
 
                 # Recurse to next node
                 self._populate_tree_recursive(tree, node_index + 1,
-                                              remaining, line_placements_copy,
-                                              ordering_copy)
+                                              remaining, line_placements,
+                                              ordering)
+
+                # Undo this branch's blade/shield and ordering updates
+                if previous_types is not None:
+                    line_placements[line_idx] = previous_types
+                else:
+                    line_placements.pop(line_idx, None)
+                ordering.restore_last_index(current_node, previous_index)
 
                 # Backtrack - clear this placement for next iteration
                 current_node.placed_quartz = None
+                self._update_line_totals(node_index, quartz_name, -1)
+
+    @staticmethod
+    def _is_unlocked(requirements: Tuple[Tuple[int, int], ...],
+                     line_vectors: List[List[int]]) -> bool:
+        """
+        Check whether any line meets an art's requirements.
+
+        Args:
+            requirements: Sparse (element_index, value) requirements of the art
+            line_vectors: Element totals of each line
+
+        Returns:
+            True if at least one line unlocks the art
+        """
+        for totals in line_vectors:
+            for elem_idx, value in requirements:
+                if totals[elem_idx] < value:
+                    break
+            else:
+                return True
+        return False
+
+    def _annotate_build(self, tree: OrbmentTree, build: Dict):
+        """Fill in a found build's per-line elements and unlocked arts."""
+        # Reconstruct the tree with this build's placements
+        tree.reset()
+        for placement in build['placements']:
+            node = tree.get_node(placement['line_index'], placement['slot_index'])
+            node.placed_quartz = placement['quartz']
+
+        # Per-line totals, so the results view doesn't have to rebuild the tree
+        build['line_elements'] = [
+            tree.calculate_elements_for_path(path, self.game_data)
+            for path in tree.get_all_paths()
+        ]
+
+        # Calculate unlocked arts
+        unlocked_arts = tree.calculate_unlocked_arts(self.game_data)
+        build['total_arts'] = len(unlocked_arts)
+        build['unlocked_arts'] = tuple(sorted(unlocked_arts))
 
     def find_builds(self, verbose: bool = True) -> List[Dict]:
         """
@@ -263,9 +492,9 @@ class BuildFinder:
         Returns:
             List of valid builds sorted by total arts (descending), each build is a dict with:
             - 'placements': List of quartz placements
-            - 'elements': Total elements achieved
+            - 'line_elements': Element totals for each line
             - 'total_arts': Number of arts unlocked
-            - 'unlocked_arts': Set of art names unlocked
+            - 'unlocked_arts': Sorted tuple of art names unlocked
         """
         if verbose:
             print(
@@ -277,10 +506,11 @@ class BuildFinder:
         if verbose:
             print(f"Tree has {len(tree.all_nodes)} slots to fill")
             print(
-                f"Searching with {len(self.relevant_quartz)} relevant quartz")
+                f"Searching with {bin(self.relevant_quartz).count('1')} relevant quartz")
 
         # Start recursive population from the first node
         # Initialize with fresh ordering tracker
+        self._prepare_search(tree)
         self._populate_tree_recursive(
             tree, 0, self.relevant_quartz, {}, LexicographicOrdering(self.prioritized_quartz))
 
@@ -293,20 +523,7 @@ class BuildFinder:
 
         # Calculate total arts for each build
         for build in self.valid_builds:
-            # Reconstruct the tree with this build's placements
-            tree.reset()
-            for placement in build['placements']:
-                # Find the node and place the quartz
-                for node in tree.all_nodes:
-                    if (node.line_index == placement['line_index'] and
-                            node.slot_index == placement['slot_index']):
-                        node.placed_quartz = placement['quartz']
-                        break
-
-            # Calculate unlocked arts
-            unlocked_arts = tree.calculate_unlocked_arts(self.game_data)
-            build['total_arts'] = len(unlocked_arts)
-            build['unlocked_arts'] = unlocked_arts
+            self._annotate_build(tree, build)
 
         # Sort by total arts (descending) - builds with more arts first
         self.valid_builds.sort(key=lambda b: b['total_arts'], reverse=True)
@@ -348,16 +565,14 @@ class BuildFinder:
         
         if verbose:
             print(f"Tree has {len(tree.all_nodes)} slots to fill")
-            print(f"Searching with {len(self.relevant_quartz)} relevant quartz")
+            print(f"Searching with {bin(self.relevant_quartz).count('1')} relevant quartz")
         
-        # Get sorted quartz and find valid first choices
-        ordering = LexicographicOrdering(self.prioritized_quartz)
-        sorted_quartz = ordering.get_sorted_available_quartz(self.relevant_quartz)
-        
-        # Build list of valid first placements
+        # Build list of valid first placements (every quartz is available,
+        # so the search-order index is the bit index)
+        allowed_quartz = self._get_allowed_quartz(first_node)
         valid_first_choices = []
-        for idx, quartz_name in enumerate(sorted_quartz):
-            if first_node.can_place_quartz(quartz_name, self.game_data):
+        for idx, quartz_name in enumerate(self.quartz_names):
+            if self.quartz_bits[quartz_name] & allowed_quartz:
                 valid_first_choices.append((quartz_name, idx))
         
         if verbose:
@@ -410,22 +625,8 @@ class BuildFinder:
             print(f"{'='*50}")
         
         # Calculate total arts for each build (reuse tree instance)
-        tree.reset()
         for build in self.valid_builds:
-            # Reconstruct the tree with this build's placements
-            tree.reset()
-            for placement in build['placements']:
-                # Find the node and place the quartz
-                for node in tree.all_nodes:
-                    if (node.line_index == placement['line_index'] and
-                            node.slot_index == placement['slot_index']):
-                        node.placed_quartz = placement['quartz']
-                        break
-            
-            # Calculate unlocked arts
-            unlocked_arts = tree.calculate_unlocked_arts(self.game_data)
-            build['total_arts'] = len(unlocked_arts)
-            build['unlocked_arts'] = unlocked_arts
+            self._annotate_build(tree, build)
         
         # Sort by total arts (descending) - builds with more arts first
         self.valid_builds.sort(key=lambda b: b['total_arts'], reverse=True)
@@ -477,7 +678,7 @@ if __name__ == "__main__":
     if builds:
         print(f"\nShowing first build:")
         first_build = builds[0]
-        print(f"Elements: {first_build['elements']}")
+        print(f"Line elements: {first_build['line_elements']}")
         print(f"\nPlacements:")
         for placement in first_build['placements']:
             shared_marker = " (SHARED)" if placement['is_shared'] else ""
@@ -7,7 +7,7 @@ Each node represents a slot in the orbment:
 - Leaf nodes are the last slots in each line
 """
 
-from typing import Optional, List, Set
+from typing import Optional, List, Set, Dict, Tuple
 from helpers import GameData, Character
 
 
@@ -15,7 +15,7 @@ class SlotNode:
     """Represents a slot in the orbment tree."""
 
     def __init__(self, slot_index: int, line_index: int,
-                 restriction: Optional[str] = None):
+                 restriction: Optional[str] = None, restriction_mask: int = 0):
         """
         Initialize a slot node.
 
@@ -23,10 +23,12 @@ class SlotNode:
             slot_index: Position of this slot in its line
             line_index: Which line this slot belongs to
             restriction: Element restriction (e.g., "Fire", "Water")
+            restriction_mask: Element bit of the restriction (see Slot)
         """
         self.slot_index = slot_index
         self.line_index = line_index
         self.restriction = restriction
+        self.restriction_mask = restriction_mask
 
         # Tree structure
         self.children: List['SlotNode'] = []
@@ -67,6 +69,9 @@ class SlotNode:
             return True
 
         quartz = game_data.quartz_map[quartz_name]
+        if self.restriction_mask:
+            return quartz.matches_restriction_mask(self.restriction_mask)
+        # Restriction without an element bit (not indexed by GameData)
         return quartz.matches_restriction(self.restriction)
 
     def __repr__(self):
@@ -93,6 +98,14 @@ class OrbmentTree:
 
         self._build_tree()
 
+        # Lookup of nodes by (line_index, slot_index)
+        self.node_map: Dict[Tuple[int, int], SlotNode] = {
+            (node.line_index, node.slot_index): node for node in self.all_nodes
+        }
+
+        # Root-to-leaf paths only depend on the topology, so compute them once
+        self._paths: List[List[SlotNode]] = self._collect_paths()
+
     def _build_tree(self):
         """Build the tree structure from character's lines."""
         if not self.character.lines:
@@ -108,7 +121,8 @@ class OrbmentTree:
             self.root = SlotNode(
                 slot_index=0,
                 line_index=-1,  # -1 indicates shared across all lines
-                restriction=first_slot.restriction
+                restriction=first_slot.restriction,
+                restriction_mask=first_slot.restriction_mask
             )
             self.all_nodes.append(self.root)
 
@@ -149,7 +163,8 @@ class OrbmentTree:
             node = SlotNode(
                 slot_index=slot_idx,
                 line_index=line_idx,
-                restriction=slot.restriction
+                restriction=slot.restriction,
+                restriction_mask=slot.restriction_mask
             )
             nodes.append(node)
             self.all_nodes.append(node)
@@ -160,13 +175,33 @@ class OrbmentTree:
 
         return nodes[0] if nodes else None
 
+    def get_node(self, line_index: int, slot_index: int) -> Optional[SlotNode]:
+        """
+        Get the node for a slot position.
+
+        Args:
+            line_index: Line index of the node (-1 for the shared root)
+            slot_index: Slot index within the line
+
+        Returns:
+            The matching node, or None if there is no such slot
+        """
+        return self.node_map.get((line_index, slot_index))
+
     def get_all_paths(self) -> List[List[SlotNode]]:
         """
         Get all paths from root to leaves (each path = one complete line).
 
+        The paths are computed once when the tree is built; callers must not
+        modify the returned lists.
+
         Returns:
             List of paths, where each path is a list of nodes
         """
+        return self._paths
+
+    def _collect_paths(self) -> List[List[SlotNode]]:
+        """Traverse the tree to collect all root-to-leaf paths."""
         if not self.root:
             return []
 
@@ -224,6 +259,31 @@ class OrbmentTree:
         # Calculate elements for this line
         return game_data.element_calc.calculate_elements(quartz_in_line)
 
+    def calculate_path_vectors(self, game_data: GameData) -> List[List[int]]:
+        """
+        Calculate element vectors for every line that has quartz placed.
+
+        Args:
+            game_data: Game data for element calculation
+
+        Returns:
+            List of element totals (indexed by game_data.element_index), one
+            per non-empty path
+        """
+        element_calc = game_data.element_calc
+        vectors = []
+
+        for path in self.get_all_paths():
+            # Get quartz in this line (includes shared nodes)
+            quartz_in_line = {node.placed_quartz for node in path
+                              if node.placed_quartz is not None}
+
+            if quartz_in_line:
+                vectors.append(
+                    element_calc.calculate_element_vector(quartz_in_line))
+
+        return vectors
+
     def calculate_unlocked_arts(self, game_data: GameData) -> Set[str]:
         """
         Calculate which arts are unlocked by the current tree configuration.
@@ -238,24 +298,25 @@ class OrbmentTree:
             Set of art names that are unlocked
         """
         unlocked_arts = set()
+        # Arts not unlocked by any line checked so far
+        pending_arts = list(game_data.art_requirements.items())
 
-        # Get all paths (each path represents one complete line)
-        paths = self.get_all_paths()
+        # Each vector holds the element totals of one complete line
+        for totals in self.calculate_path_vectors(game_data):
+            still_pending = []
 
-        for path in paths:
-            # Calculate elements for this line
-            line_elements = self.calculate_elements_for_path(path, game_data)
-
-            if not line_elements:
-                continue
-
-            # Check which arts this line unlocks
-            for art_name, art in game_data.arts_map.items():
+            # Check which remaining arts this line unlocks
+            for art_name, requirements in pending_arts:
                 # Check if all requirements are met
-                if all(line_elements.get(elem, 0) >= value
-                       for elem, value in art.requirements.items()):
+                for elem_idx, value in requirements:
+                    if totals[elem_idx] < value:
+                        still_pending.append((art_name, requirements))
+                        break
+                else:
                     unlocked_arts.add(art_name)
 
+            pending_arts = still_pending
+
         return unlocked_arts
 
     def count_unlocked_arts(self, game_data: GameData) -> int: